@@ -0,0 +1,62 @@
+"""Kontroll i faqosjes keyset të `list_category_page` mbi katalogun real të ndërtuar nga fixtures në cache/.
+
+Kopjon cache/ në një direktori të përkohshme, ngre stand-in-in lokal të gzk.rks-gov.net nga
+`load_sse` dhe i përshkon të gjitha faqet për çdo `page_size` nga 1 deri te `--max-page-size`.
+Dështon nëse ndonjë përshkim nuk kthen saktësisht `total` rreshta, ose kthen një rresht dy herë.
+
+    python bench/check_paging.py --max-page-size 59
+"""
+import os, sys, shutil, argparse, tempfile
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "server"))
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from load_sse import FIXTURES, start_gazette_standin
+
+
+def _walk(server: Any, page_size: int, **filters: Any) -> Dict[str, Any]:
+    items: List[Dict[str, Any]] = []
+    cursor: Optional[str] = None
+    while True:
+        page = server._list_category_page_core(page_size=page_size, cursor=cursor, **filters)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return {"items": items, "total": page["total"]}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Kontroll i faqosjes keyset të katalogut.")
+    ap.add_argument("--max-page-size", type=int, default=59)
+    args = ap.parse_args(argv)
+
+    work = tempfile.mkdtemp(prefix="kosovo-paging-")
+    cache = os.path.join(work, "cache")
+    shutil.copytree(FIXTURES, cache)
+    standin, upstream = start_gazette_standin()
+    os.environ.update(KOSOVO_CACHE_DIR=cache, GZK_UPSTREAM=upstream, GZK_FETCH_DELAY="0")
+    try:
+        import server
+        failures = []
+        total = None
+        for size in range(1, args.max_page_size + 1):
+            res = _walk(server, size)
+            keys = [server._sort_key(r) for r in res["items"]]
+            total = res["total"]
+            if len(keys) != total or len(set(keys)) != total:
+                failures.append((size, len(keys), len(set(keys))))
+        print(f"katalogu: {total} rreshta, page_size 1..{args.max_page_size}")
+        for size, got, uniq in failures:
+            print(f"  ❌ page_size={size}: {got} rreshta ({uniq} unikë), pritej {total}")
+        if failures:
+            sys.exit(1)
+        print("  ✅ çdo përshkim kthen saktësisht `total` rreshta")
+    finally:
+        standin.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""Test ngarkese me shumë klientë të njëkohshëm kundër endpoint-it SSE të serverit MCP.
+
+Harness-i:
+  * ngre një stand-in lokal të gzk.rks-gov.net që shërben faqet HTML nga fixtures në cache/ dhe
+    PDF-të e korpusit sintetik në bench/fixtures/,
+  * nis `server/server.py` (mcp.run(transport="sse")) si proces më vete me GZK_UPSTREAM drejt stand-in-it
+    dhe GZK_FETCH_DELAY=0 (pa pauzën e mirësjelljes ndaj burimit),
+  * ingeston korpusin e fixtures përmes `ingest_pdfs` dhe dështon nëse indeksi mbetet bosh,
+  * lëshon N klientë MCP mbi SSE me një përzierje mjetesh dhe raporton throughput (brenda dritares
+    së matjes), latencë (p50/p90/p99) dhe shkallën e gabimeve.
+
+Faqet e detajeve në cache/html nuk kanë lidhje PDF (shkarkimi bëhet me postback), prandaj katalogu
+i crawl-uar nuk sjell PDF; indeksi ndërtohet vetëm nga korpusi në bench/fixtures/.
+
+Skenarët:
+  cold – cache bosh; faqet merren nga stand-in-i, PDF-të shkarkohen dhe nxirren gjatë ingestion-it
+         (koha raportohet si `seed_s`).
+  warm – kopje e fixtures në cache/, ingestion dhe një kalim ngrohjeje para matjes.
+
+    python bench/load_sse.py --scenario both --concurrency 16 --duration 60 \\
+        --mix ask=2,search_articles=3,which_law_applies=2,index_stats=1
+"""
+import os, sys, json, time, random, socket, shutil, hashlib, asyncio, argparse, tempfile, threading, subprocess
+import urllib.parse as _u
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastmcp import Client
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FIXTURES = os.path.join(ROOT, "cache")
+PDF_FIXTURES = os.path.join(ROOT, "bench", "fixtures")
+CANONICAL_BASE = "https://gzk.rks-gov.net"
+BENCH_PREFIX = "/__bench__/"
+
+PROMPTS = {
+    "ask": [
+        "Cilat ligje janë publikuar në vitin 2025?",
+        "Cili ligj e rregullon administratën publike në Republikën e Kosovës?",
+        "Në cilin ligj trajtohet arsimi i lartë?",
+        "Lista e ligjeve nga 2021 deri 2023",
+    ],
+    "search_articles": [
+        "zyrtarët publikë", "arsimi i lartë", "prokuroria", "buxheti", "tatimi në pronë",
+    ],
+    "which_law_applies": [
+        "Punëdhënësi nuk më ka paguar pagën",
+        "Si regjistrohet një biznes i ri?",
+        "Kush e emëron Këshillin Prokurorial?",
+    ],
+    "index_stats": [None],
+}
+_ARG_NAME = {"ask": "prompt", "search_articles": "query", "which_law_applies": "prompt"}
+
+
+def _hash(s: str) -> str:
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()[:24]
+
+
+def fixture_acts() -> List[Dict[str, Any]]:
+    """Rreshtat e katalogut për PDF-të sintetike në bench/fixtures/ (URL kanonike, të shërbyera nga stand-in-i)."""
+    rows = []
+    for i, name in enumerate(sorted(n for n in os.listdir(PDF_FIXTURES) if n.endswith(".pdf")), start=1):
+        title = os.path.splitext(name)[0].replace("_", " ").capitalize()
+        rows.append({"act_id": f"bench-{i}", "title": title, "year": 2025,
+                     "pdf_url": CANONICAL_BASE + BENCH_PREFIX + name, "detail_url": None})
+    return rows
+
+
+# ---------------------------------------------------------------- stand-in i gzk.rks-gov.net
+
+class _GazetteHandler(BaseHTTPRequestHandler):
+    fixtures = FIXTURES
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _canonical(self) -> str:
+        return CANONICAL_BASE + self.path
+
+    def _send(self, path: Optional[str], ctype: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if not path or not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = self._canonical()
+        if self.path.startswith(BENCH_PREFIX):
+            name = os.path.basename(self.path[len(BENCH_PREFIX):])
+            self._send(os.path.join(PDF_FIXTURES, name), "application/pdf")
+            return
+        low = url.lower()
+        if ".pdf" in low or "downloaddocument.aspx" in low:
+            self._send(os.path.join(self.fixtures, "pdf", f"{_hash(url)}.pdf"), "application/pdf")
+            return
+        self._send(os.path.join(self.fixtures, "html", f"{_hash(url)}.html"), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        form = {k: v[0] for k, v in _u.parse_qs(self.rfile.read(n).decode("utf-8", "ignore")).items()}
+        referer = self.headers.get("Referer") or self._canonical()
+        # Postback-u i vitit në gzk_category._fetch_year_html ruhet me këtë çelës.
+        key = f"{referer}|post|{form.get('__EVENTTARGET', '')}|{form.get('__EVENTARGUMENT', '')}|None"
+        p = os.path.join(self.fixtures, "html", f"{_hash(key)}.html")
+        if not os.path.exists(p):
+            p = os.path.join(self.fixtures, "html", f"{_hash(self._canonical())}.html")
+        self._send(p, "text/html; charset=utf-8")
+
+
+def start_gazette_standin(latency_ms: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    handler = type("Handler", (_GazetteHandler,), {"latency": latency_ms / 1000.0})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+
+# ---------------------------------------------------------------- serveri MCP
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _prepare_cache(scenario: str) -> str:
+    work = tempfile.mkdtemp(prefix=f"kosovo-load-{scenario}-")
+    cache = os.path.join(work, "cache")
+    if scenario == "warm":
+        shutil.copytree(FIXTURES, cache)
+    else:
+        os.makedirs(cache)
+    return cache
+
+
+def start_server(cache_dir: str, upstream: str, port: int, fetch_delay: float = 0.0,
+                 timeout: float = 60.0) -> subprocess.Popen:
+    env = dict(os.environ, KOSOVO_CACHE_DIR=cache_dir, GZK_UPSTREAM=upstream, PORT=str(port),
+               GZK_FETCH_DELAY=str(fetch_delay), PYTHONUNBUFFERED="1")
+    log = open(os.path.join(os.path.dirname(cache_dir), "server.log"), "w", encoding="utf-8")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "server", "server.py")],
+                            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    start = time.time()
+    while time.time() - start < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Serveri u ndal me kod {proc.returncode} (shih {log.name}).")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Serveri nuk u nis në kohë.")
+
+
+# ---------------------------------------------------------------- gjeneratori i ngarkesës
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, w = part.partition("=")
+        name = name.strip()
+        if name not in PROMPTS:
+            raise ValueError(f"Mjet i panjohur në mix: {name}")
+        mix[name] = float(w or 1)
+    return mix
+
+
+def _tool_args(tool: str, rnd: random.Random) -> Dict[str, Any]:
+    arg = rnd.choice(PROMPTS[tool])
+    return {_ARG_NAME[tool]: arg} if tool in _ARG_NAME else {}
+
+
+async def _one_call(client: Client, tool: str, args: Dict[str, Any], timeout: float) -> Tuple[bool, str]:
+    try:
+        res = await asyncio.wait_for(client.call_tool(tool, args, raise_on_error=False), timeout)
+    except Exception as e:
+        return False, type(e).__name__
+    if getattr(res, "is_error", False):
+        return False, "ToolError"
+    data = getattr(res, "data", None)
+    if tool == "ask" and isinstance(data, dict) and data.get("ok") is False:
+        return False, "AskError"
+    return True, ""
+
+
+Sample = Tuple[str, float, float, bool, str]  # (mjeti, fillimi, fundi, ok, gabimi)
+
+
+async def _worker(url: str, mix: Dict[str, float], deadline: float, max_calls: Optional[int],
+                  timeout: float, seed: int, samples: List[Sample], counter: List[int]) -> None:
+    rnd = random.Random(seed)
+    tools, weights = list(mix), list(mix.values())
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            if max_calls is not None:
+                if counter[0] >= max_calls:
+                    return
+                counter[0] += 1
+            tool = rnd.choices(tools, weights)[0]
+            t0 = time.monotonic()
+            ok, err = await _one_call(client, tool, _tool_args(tool, rnd), timeout)
+            samples.append((tool, t0, time.monotonic(), ok, err))
+
+
+def _pct(xs: List[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    i = min(len(xs) - 1, max(0, int(round(q * (len(xs) - 1)))))
+    return xs[i]
+
+
+def summarize(samples: List[Sample], t0: float, window_end: float, drained_at: float) -> Dict[str, Any]:
+    """`rps` numëron vetëm thirrjet e përfunduara brenda dritares [t0, window_end]; latenca dhe gabimet
+    përfshijnë edhe thirrjet që përfunduan gjatë shkarkimit pas afatit."""
+    window = max(window_end - t0, 1e-9)
+
+    def block(rows: List[Sample]) -> Dict[str, Any]:
+        lat = [(r[2] - r[1]) * 1000 for r in rows]
+        errs = [r for r in rows if not r[3]]
+        kinds: Dict[str, int] = {}
+        for r in errs:
+            kinds[r[4]] = kinds.get(r[4], 0) + 1
+        in_window = sum(1 for r in rows if r[2] <= window_end)
+        return {"calls": len(rows),
+                "rps": round(in_window / window, 2),
+                "error_rate": round(len(errs) / len(rows), 4) if rows else 0.0,
+                "errors": kinds,
+                "p50_ms": round(_pct(lat, 0.50), 1), "p90_ms": round(_pct(lat, 0.90), 1),
+                "p99_ms": round(_pct(lat, 0.99), 1), "max_ms": round(max(lat), 1) if lat else 0.0}
+
+    out = block(samples)
+    out["elapsed_s"] = round(window, 2)
+    out["drain_s"] = round(max(drained_at - window_end, 0.0), 2)
+    out["per_tool"] = {t: block([s for s in samples if s[0] == t]) for t in sorted({s[0] for s in samples})}
+    return out
+
+
+async def run_load(url: str, mix: Dict[str, float], concurrency: int, duration: float,
+                   max_calls: Optional[int] = None, timeout: float = 120.0, seed: int = 0) -> Dict[str, Any]:
+    samples: List[Sample] = []
+    counter = [0]
+    t0 = time.monotonic()
+    deadline = t0 + duration
+    results = await asyncio.gather(*[
+        _worker(url, mix, deadline, max_calls, timeout, seed + i, samples, counter) for i in range(concurrency)
+    ], return_exceptions=True)
+    drained_at = time.monotonic()
+    # Me --max-calls ngarkesa mund të mbarojë para afatit; atëherë dritarja mbyllet me thirrjen e fundit.
+    window_end = min(deadline, drained_at)
+    report = summarize(samples, t0, window_end, drained_at)
+    report["client_failures"] = sum(1 for r in results if isinstance(r, Exception))
+    return report
+
+
+def _result_data(res: Any) -> Any:
+    return getattr(res, "data", None) or getattr(res, "structured_content", None)
+
+
+async def seed_corpus(url: str, timeout: float) -> Dict[str, Any]:
+    """Ingeston korpusin e fixtures dhe verifikon që indeksi nuk është bosh."""
+    async with Client(url) as client:
+        t0 = time.monotonic()
+        await asyncio.wait_for(client.call_tool("ingest_pdfs", {"rows": fixture_acts()}), timeout)
+        seed_s = time.monotonic() - t0
+        stats = _result_data(await client.call_tool("index_stats", {})) or {}
+    rows = int(stats.get("index_rows") or 0)
+    if rows == 0:
+        raise RuntimeError("Indeksi është bosh pas ingestion-it – matja nuk do të kishte kuptim.")
+    return {"seed_s": round(seed_s, 2), "index_rows": rows}
+
+
+async def warm_up(url: str, mix: Dict[str, float], timeout: float) -> None:
+    async with Client(url) as client:
+        for tool in mix:
+            for args in PROMPTS[tool]:
+                await _one_call(client, tool, {_ARG_NAME[tool]: args} if tool in _ARG_NAME else {}, timeout)
+
+
+def run_scenario(scenario: str, args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    standin, upstream = start_gazette_standin(args.upstream_latency)
+    cache = _prepare_cache(scenario)
+    port = _free_port()
+    proc = start_server(cache, upstream, port, args.fetch_delay)
+    url = f"http://127.0.0.1:{port}/sse"
+    try:
+        seeded = asyncio.run(seed_corpus(url, args.timeout))
+        if scenario == "warm":
+            asyncio.run(warm_up(url, mix, args.timeout))
+        report = asyncio.run(run_load(url, mix, args.concurrency, args.duration,
+                                      args.max_calls, args.timeout, args.seed))
+        report.update(seeded)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        standin.shutdown()
+        if not args.keep:
+            shutil.rmtree(os.path.dirname(cache), ignore_errors=True)
+    report.update({"scenario": scenario, "concurrency": args.concurrency, "mix": mix,
+                   "fetch_delay_s": args.fetch_delay})
+    return report
+
+
+def _print_report(r: Dict[str, Any]) -> None:
+    print(f"\n== {r['scenario']} | {r['concurrency']} klientë | dritarja {r['elapsed_s']}s "
+          f"(+{r['drain_s']}s shkarkim) | ingestion {r['seed_s']}s, {r['index_rows']} nene "
+          f"| fetch delay {r['fetch_delay_s']}s ==")
+    print(f"{'mjeti':<20}{'thirrje':>9}{'rps':>9}{'gabime':>9}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    rows = list(r["per_tool"].items()) + [("TOTAL", r)]
+    for name, b in rows:
+        print(f"{name:<20}{b['calls']:>9}{b['rps']:>9}{b['error_rate']:>9.2%}"
+              f"{b['p50_ms']:>10}{b['p90_ms']:>10}{b['p99_ms']:>10}{b['max_ms']:>10}")
+    if r["errors"]:
+        print("gabimet:", json.dumps(r["errors"], ensure_ascii=False))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Test ngarkese për serverin SSE të Kosovo Laws MCP.")
+    ap.add_argument("--scenario", choices=["cold", "warm", "both"], default="both")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=30.0, help="sekonda matjeje për skenar")
+    ap.add_argument("--max-calls", type=int, default=None, help="ndalo pas kaq thirrjeve gjithsej")
+    ap.add_argument("--mix", default="ask=2,search_articles=3,which_law_applies=2,index_stats=1")
+    ap.add_argument("--timeout", type=float, default=120.0, help="timeout për thirrje (s)")
+    ap.add_argument("--upstream-latency", type=int, default=0, help="vonesë artificiale e stand-in-it (ms)")
+    ap.add_argument("--fetch-delay", type=float, default=0.0,
+                    help="GZK_FETCH_DELAY për serverin: pauza pas çdo kërkese të pa-cache-uar (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", dest="json_out", default=None, help="ruaj raportin si JSON")
+    ap.add_argument("--keep", action="store_true", help="mos i fshi direktoritë e përkohshme të cache-it")
+    args = ap.parse_args(argv)
+
+    scenarios = ["cold", "warm"] if args.scenario == "both" else [args.scenario]
+    reports = [run_scenario(s, args) for s in scenarios]
+    for r in reports:
+        _print_report(r)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Gjeneron korpusin sintetik të PDF-ve në bench/fixtures/ (ligje në stilin e Gazetës Zyrtare, 20 nene secili)
+dhe PDF-të e krahasimit të nxjerrjes në bench/fixtures/extract/ (një kolonë me referenca "Neni N" brenda fjalisë,
+dy kolona me hapësirë të gjerë dhe dy kolona të justifikuara me hapësirë të ngushtë ndërmjet tyre).
+
+Kërkon reportlab (vetëm për këtë skript). PDF-të krijohen me `invariant=1`, pra riekzekutimi jep të njëjtët bajtë.
+
+    python bench/make_fixtures.py
+"""
+import os, random, argparse
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+WORDS = ("zyrtari publik ka të drejtë për pagë sipas kategorisë së pozitës dhe punëdhënësi detyrohet "
+         "ta paguajë brenda afatit ligjor në përputhje me dispozitat").split()
+
+LAWS: Dict[str, Tuple[str, List[str]]] = {
+    "ligji_zyrtaret_publike.pdf": ("LIGJI NR. 99/L-001 PËR ZYRTARËT PUBLIKË", [
+        "Zyrtari publik ka të drejtë për pagë të rregullt mujore sipas kategorisë së pozitës.",
+        "Punëdhënësi detyrohet ta paguajë pagën jo më vonë se dita e pesëmbëdhjetë e muajit pasues.",
+        "Në rast të vonesës së pagës, zyrtari mund të paraqesë ankesë në Këshillin e Pavarur Mbikëqyrës.",
+        "Pranimi në shërbimin civil bëhet përmes konkursit publik dhe të hapur.",
+        "Zyrtari publik është i detyruar të veprojë në mënyrë të paanshme dhe profesionale.",
+        "Masat disiplinore shqiptohen pas procedurës në të cilën zyrtari dëgjohet.",
+        "Orari i punës është dyzet orë në javë, përveç kur ligji parasheh ndryshe.",
+        "Pushimi vjetor me pagesë nuk mund të jetë më i shkurtër se njëzet ditë pune.",
+    ]),
+    "ligji_arsimi_larte.pdf": ("LIGJI NR. 99/L-002 PËR ARSIMIN E LARTË", [
+        "Institucionet e arsimit të lartë akreditohen nga Agjencia e Kosovës për Akreditim.",
+        "Studimet organizohen në tri cikle: bachelor, master dhe doktoratë.",
+        "Universiteti publik financohet nga buxheti i Republikës së Kosovës dhe nga të hyrat vetanake.",
+        "Studentët kanë të drejtë të ankohen për vlerësimin në provim brenda tri ditëve.",
+        "Senati është organi më i lartë akademik i universitetit.",
+        "Autonomia akademike garantohet për mësimdhënien dhe kërkimin shkencor.",
+        "Tarifat e studimit përcaktohen me vendim të këshillit drejtues.",
+        "Personeli akademik zgjidhet përmes konkursit publik çdo pesë vjet.",
+    ]),
+    "ligji_shoqerite_tregtare.pdf": ("LIGJI NR. 99/L-003 PËR SHOQËRITË TREGTARE", [
+        "Regjistrimi i biznesit bëhet në Agjencinë për Regjistrimin e Bizneseve të Kosovës.",
+        "Kërkesa për regjistrim i biznesit të ri përmban emrin, selinë dhe veprimtarinë e shoqërisë.",
+        "Shoqëria me përgjegjësi të kufizuar mund të themelohet nga një ose më shumë persona.",
+        "Kapitali themeltar i shoqërisë aksionare nuk mund të jetë më i vogël se dhjetë mijë euro.",
+        "Biznesi i regjistruar detyrohet të paguajë tatimin në pronë dhe tatimet e tjera sipas ligjit.",
+        "Drejtori menaxhon punët e përditshme të shoqërisë dhe e përfaqëson atë.",
+        "Pasqyrat financiare vjetore dorëzohen deri më tridhjetë e një mars.",
+        "Shoqëria shuhet me vendim të pronarëve ose me vendim të gjykatës.",
+    ]),
+}
+
+
+def make_law(path: str, title: str, sentences: List[str], articles: int = 20) -> None:
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    c.setTitle(title)
+    y = 800
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(60, y, "GAZETA ZYRTARE E REPUBLIKËS SË KOSOVËS")
+    y -= 24
+    c.drawString(60, y, title)
+    y -= 30
+    for n in range(1, articles + 1):
+        if y < 120:
+            c.showPage()
+            y = 800
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(60, y, f"Neni {n}")
+        y -= 16
+        c.setFont("Helvetica", 10)
+        for k in range(3):
+            c.drawString(60, y, f"{k + 1}. " + sentences[(n + k * 3) % len(sentences)])
+            y -= 14
+        y -= 10
+    c.save()
+
+
+def make_single_column(path: str, pages: int = 12) -> None:
+    """Një kolonë; rreshti i dytë i çdo neni përmban referencën "sipas Neni N" brenda fjalisë."""
+    rnd = random.Random(1)
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    n = 1
+    for _ in range(pages):
+        y = 800
+        while y > 100:
+            c.setFont("Helvetica-Bold", 10)
+            c.drawString(60, y, f"Neni {n}")
+            y -= 15
+            c.setFont("Helvetica", 10)
+            for k in range(4):
+                t = " ".join(rnd.choice(WORDS) for _ in range(14))
+                if k == 1:
+                    t = t[:40] + f" sipas Neni {max(1, n - 1)} të këtij ligji " + t[40:70]
+                c.drawString(60, y, t)
+                y -= 13
+            n += 1
+            y -= 8
+        c.showPage()
+    c.save()
+
+
+def make_two_column(path: str, pages: int = 4) -> None:
+    """Dy kolona me hapësirë të gjerë (x=40 dhe x=310), rreshta të shkurtër 9pt."""
+    rnd = random.Random(2)
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    n = 1
+    for _ in range(pages):
+        for x in (40, 310):
+            y = 800
+            while y > 100:
+                c.setFont("Helvetica-Bold", 9)
+                c.drawString(x, y, f"Neni {n}")
+                y -= 13
+                c.setFont("Helvetica", 9)
+                for _ in range(4):
+                    c.drawString(x, y, " ".join(rnd.choice(WORDS) for _ in range(6)))
+                    y -= 11
+                n += 1
+                y -= 6
+        c.showPage()
+    c.save()
+
+
+def _justified(c: canvas.Canvas, x: float, y: float, width: float, words: List[str], size: float) -> None:
+    """Rresht i justifikuar me hapësirë fjalësh (operatori Tw), si në PDF-të e faqosura."""
+    line = " ".join(words)
+    t = c.beginText(x, y)
+    t.setFont("Helvetica", size)
+    t.setWordSpace((width - c.stringWidth(line, "Helvetica", size)) / max(len(words) - 1, 1))
+    t.textLine(line)
+    c.drawText(t)
+
+
+def make_two_column_justified(path: str, pages: int = 2, size: float = 10, gutter: float = 14) -> None:
+    """Dy kolona me tekst të justifikuar 10pt dhe vetëm 14pt ndërmjet kolonave. Nenet rrjedhin nga
+    një kolonë në tjetrën, prandaj titujt "Neni N: Titull" bien krah rreshtave me tekst të kolonës tjetër."""
+    rnd = random.Random(3)
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    left, right = 50.0, A4[0] - 50.0
+    col = (right - left - gutter) / 2
+    n, pending = 1, 0
+    for _ in range(pages):
+        for x in (left, left + col + gutter):
+            y = 800.0
+            while y > 100:
+                if pending == 0:
+                    c.setFont("Helvetica-Bold", size)
+                    c.drawString(x, y, f"Neni {n}: {rnd.choice(WORDS).capitalize()}")
+                    n, pending = n + 1, rnd.randint(3, 7)
+                else:
+                    c.setFont("Helvetica", size)
+                    words: List[str] = []
+                    while True:
+                        w = rnd.choice(WORDS)
+                        if c.stringWidth(" ".join(words + [w]), "Helvetica", size) > col * 0.85:
+                            break
+                        words.append(w)
+                    _justified(c, x, y, col, words, size)
+                    pending -= 1
+                y -= size * 1.3
+        c.showPage()
+    c.save()
+
+
+EXTRACT = {
+    "single12.pdf": make_single_column,
+    "twocol4.pdf": make_two_column,
+    "twocol_justified.pdf": make_two_column_justified,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Gjeneron PDF-të sintetike të bench/fixtures/.")
+    ap.add_argument("--out", default=FIXTURES)
+    args = ap.parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+    for name, (title, sentences) in LAWS.items():
+        make_law(os.path.join(args.out, name), title, sentences)
+        print(f"📄 {os.path.join(args.out, name)}")
+    extract = os.path.join(args.out, "extract")
+    os.makedirs(extract, exist_ok=True)
+    for name, make in EXTRACT.items():
+        make(os.path.join(extract, name))
+        print(f"📄 {os.path.join(extract, name)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Krahasim i nxjerrjes së tekstit nga PDF: analiza e plotë e layout-it (si më parë, `LAParams()` mbi
+gjithë dokumentin) kundrejt motorit me nivele në `pdf_ingest` (pa layout, me rikthim te layout-i
+vetëm për faqet që nuk e kalojnë kontrollin e cilësisë). Cache-i nuk përdoret.
+
+    python bench/pdf_extract.py                     # PDF-të në bench/fixtures/ dhe bench/fixtures/extract/
+    python bench/pdf_extract.py cache/pdf/*.pdf --repeat 5
+"""
+import os, sys, glob, time, argparse
+from io import StringIO
+from typing import List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "server"))
+
+from pdfminer.high_level import extract_text_to_fp
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from pdf_ingest import extract_page, layout_page_text, split_articles
+
+
+def _full_layout(path: str) -> str:
+    buf = StringIO()
+    with open(path, "rb") as f:
+        extract_text_to_fp(f, buf, laparams=LAParams(), output_type="text", codec=None)
+    return buf.getvalue()
+
+
+def _tiered(path: str) -> tuple:
+    rsrc = PDFResourceManager()
+    pages, tiers = [], []
+    with open(path, "rb") as f:
+        for page in PDFPage.get_pages(f):
+            text, tier = extract_page(rsrc, page)
+            pages.append(text)
+            tiers.append(tier)
+    return "".join(pages), tiers
+
+
+def _per_page_layout(path: str) -> str:
+    """Vetëm niveli `layout` faqe për faqe — ndan fitimin e nxjerrjes për faqe nga fitimi i nivelit pa layout."""
+    rsrc = PDFResourceManager()
+    with open(path, "rb") as f:
+        return "".join(layout_page_text(rsrc, page) for page in PDFPage.get_pages(f))
+
+
+def _best(fn, path: str, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(path)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Krahasim i nxjerrjes së tekstit nga PDF.")
+    ap.add_argument("pdfs", nargs="*")
+    ap.add_argument("--repeat", type=int, default=5, help="përsëritje; raportohet minimumi")
+    args = ap.parse_args(argv)
+    paths = args.pdfs or sorted(glob.glob(os.path.join(ROOT, "bench", "fixtures", "*.pdf"))
+                                + glob.glob(os.path.join(ROOT, "bench", "fixtures", "extract", "*.pdf")))
+
+    print(f"{'pdf':<36}{'faqe':>6}{'layout s':>10}{'faqe s':>10}{'nivele s':>10}{'shpejt.':>9}{'fallback':>10}  nenet")
+    tot_base = tot_page = tot_tier = 0.0
+    for p in paths:
+        t_base, base = _best(_full_layout, p, args.repeat)
+        t_page, _ = _best(_per_page_layout, p, args.repeat)
+        t_tier, (text, tiers) = _best(_tiered, p, args.repeat)
+        tot_base += t_base
+        tot_page += t_page
+        tot_tier += t_tier
+        fallback = sum(1 for t in tiers if t != "no_layout")
+        same = [a["article_no"] for a in split_articles(base)] == [a["article_no"] for a in split_articles(text)]
+        print(f"{os.path.basename(p)[:35]:<36}{len(tiers):>6}{t_base:>10.3f}{t_page:>10.3f}{t_tier:>10.3f}"
+              f"{t_base / t_tier if t_tier else 0:>8.2f}x{fallback:>10}  {'të njëjta' if same else 'NDRYSHOJNË'}")
+    if paths:
+        print(f"{'TOTAL':<42}{tot_base:>10.3f}{tot_page:>10.3f}{tot_tier:>10.3f}{tot_base / tot_tier if tot_tier else 0:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Grafi i ndryshimeve/shfuqizimeve ndërmjet akteve, i çelësuar sipas ActID.
+
+Çdo nyje: {"title", "title_src", "published_on", "repealed", "parsed", "in": {kind: [act_id]}, "out": {kind: [act_id]}}
+ku `out[kind]` janë aktet që ky akt i prek dhe `in[kind]` aktet që e prekin këtë akt;
+`parsed` shënon nyjet për të cilat është lexuar vetë faqja e detajeve. Titulli nga lidhja e një akti
+tjetër (`title_src="link"`) ka përparësi ndaj titullit të katalogut.
+Llojet: amend, repeal, repeal_partial, related.
+"""
+import os, re, json
+from typing import Any, Dict, List, Optional
+
+from index_utils import GRAPH_PATH, write_json_atomic
+
+Graph = Dict[str, Dict[str, Any]]
+_CHANGE_KINDS = ("amend", "repeal_partial", "repeal")
+# Titujt e seksioneve të faqes së detajeve (p.sh. "Ndryshon / Plotëson / Shfuqizon") nuk janë tituj aktesh.
+_SECTION_HEADER = re.compile(
+    r"^\s*(ndryshon|ndryshohet|plotëson|plotësohet|shfuqizon|shfuqizohet|shfuqizuar|"
+    r"izmenjuje|izmenjen|promenjen|uzrokuje|ukida|ukinut|amended|amends|repealed)\b[\s/a-zë,-]*$",
+    re.I)
+
+
+def load_graph() -> Graph:
+    if not os.path.exists(GRAPH_PATH):
+        return {}
+    try:
+        with open(GRAPH_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_graph(graph: Graph) -> None:
+    """Thirrësi duhet ta mbajë bllokimin që mbron `graph` gjatë serializimit."""
+    write_json_atomic(GRAPH_PATH, graph)
+
+
+def _usable_title(title: Optional[str]) -> bool:
+    return bool(title) and not _SECTION_HEADER.match(title)
+
+
+def _node(graph: Graph, act_id: str, title: Optional[str] = None,
+          published_on: Optional[str] = None, title_src: str = "catalog") -> Dict[str, Any]:
+    n = graph.get(act_id)
+    if n is None:
+        n = graph[act_id] = {"title": None, "title_src": None, "published_on": None, "repealed": False,
+                             "parsed": False, "in": {}, "out": {}}
+    if _usable_title(title):
+        upgrade = title_src == "link" and n.get("title_src") != "link"
+        if upgrade or not _usable_title(n["title"]):
+            n["title"], n["title_src"] = title, title_src
+    if published_on and not n["published_on"]:
+        n["published_on"] = published_on
+    return n
+
+
+def _link(graph: Graph, src: str, dst: str, kind: str) -> None:
+    out = graph[src]["out"].setdefault(kind, [])
+    if dst not in out:
+        out.append(dst)
+    inc = graph[dst]["in"].setdefault(kind, [])
+    if src not in inc:
+        inc.append(src)
+    if kind == "repeal":
+        graph[dst]["repealed"] = True
+
+
+def add_relations(graph: Graph, act_id: str, relations: Dict[str, Any],
+                  title: Optional[str] = None, published_on: Optional[str] = None) -> None:
+    """Shton në graf lidhjet e nxjerra nga `gzk_category.extract_relations` për aktin `act_id`."""
+    act_id = str(act_id)
+    node = _node(graph, act_id, title, published_on)
+    node["parsed"] = True
+    if relations.get("repealed"):
+        node["repealed"] = True
+    for r in relations.get("in", []):
+        other = str(r["act_id"])
+        _node(graph, other, r.get("title"), r.get("published_on"), title_src="link")
+        _link(graph, other, act_id, r["kind"])
+    for r in relations.get("out", []):
+        other = str(r["act_id"])
+        _node(graph, other, r.get("title"), r.get("published_on"), title_src="link")
+        _link(graph, act_id, other, r["kind"])
+
+
+def is_repealed(graph: Graph, act_id: Optional[str]) -> bool:
+    n = graph.get(str(act_id)) if act_id else None
+    return bool(n and n.get("repealed"))
+
+
+def _brief(graph: Graph, act_id: str) -> Dict[str, Any]:
+    n = graph.get(act_id) or {}
+    return {"act_id": act_id, "title": n.get("title"), "published_on": n.get("published_on"),
+            "repealed": bool(n.get("repealed"))}
+
+
+def _date_key(d: Optional[str]) -> str:
+    if not d:
+        return ""
+    parts = d.replace("/", ".").split(".")
+    return "".join(reversed(parts)) if len(parts) == 3 else d
+
+
+def act_relations(graph: Graph, act_id: str) -> Optional[Dict[str, Any]]:
+    n = graph.get(str(act_id))
+    if n is None:
+        return None
+    out = _brief(graph, str(act_id))
+    out["changed_by"] = {k: [_brief(graph, a) for a in ids] for k, ids in n["in"].items()}
+    out["changes"] = {k: [_brief(graph, a) for a in ids] for k, ids in n["out"].items()}
+    return out
+
+
+def amendment_chain(graph: Graph, act_id: str) -> Optional[Dict[str, Any]]:
+    """Zinxhiri transitiv i akteve që e ndryshojnë/shfuqizojnë aktin, i renditur sipas datës,
+    dhe akti(et) aktual(e) që e zëvendësojnë nëse akti është shfuqizuar."""
+    act_id = str(act_id)
+    if act_id not in graph:
+        return None
+    chain: List[Dict[str, Any]] = []
+    seen = {act_id}
+    queue = [act_id]
+    while queue:
+        cur = queue.pop(0)
+        for kind in _CHANGE_KINDS:
+            for src in graph[cur]["in"].get(kind, []):
+                if src in seen:
+                    continue
+                seen.add(src)
+                item = _brief(graph, src)
+                item.update({"relation": kind, "target": cur})
+                chain.append(item)
+                queue.append(src)
+    chain.sort(key=lambda c: _date_key(c.get("published_on")))
+
+    current: List[Dict[str, Any]] = []
+    if is_repealed(graph, act_id):
+        visited = {act_id}
+        frontier = [act_id]
+        while frontier:
+            cur = frontier.pop(0)
+            for src in graph[cur]["in"].get("repeal", []):
+                if src in visited:
+                    continue
+                visited.add(src)
+                if is_repealed(graph, src):
+                    frontier.append(src)
+                else:
+                    current.append(_brief(graph, src))
+
+    out = _brief(graph, act_id)
+    out.update({"chain": chain, "current": current})
+    return out
@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Optional, Tuple
-import re, os, hashlib, time, urllib.parse as _u
+import re, os, hashlib, urllib.parse as _u
 from bs4 import BeautifulSoup
-from index_utils import SESS, HEADERS, http_get_cached, urljoin, HTML_DIR
+from index_utils import SESS, HEADERS, http_get_cached, urljoin, upstream_url, polite_sleep, HTML_DIR
 
 SEED_URL = "https://gzk.rks-gov.net/ActsByCategoryInst.aspx?Index=3&InstID={inst_id}&CatID={cat_id}"
 
@@ -79,7 +79,7 @@ def _post_lang_dropdown(detail_url: str, detail_html: str) -> Optional[str]:
     data["__EVENTARGUMENT"] = opt_sq.get("value") or ""
     headers = dict(HEADERS)
     headers["Referer"] = detail_url
-    r = SESS.post(detail_url, headers=headers, data=data, timeout=60)
+    r = SESS.post(upstream_url(detail_url), headers=headers, data=data, timeout=60)
     r.raise_for_status()
 
     if "Republika e Kosovës" not in r.text and "Ligji" not in r.text:
@@ -112,6 +112,49 @@ def _strip_foreign_suffix(title: str) -> str:
         t = t.replace(bad, "").strip(" –-")
     return t.strip()
 
+_REL_SECTIONS = (("#MainContent_drActRelated", "in"), ("#MainContent_drNActRelated", "out"))
+_REPEALED_MARKERS = ("shfuqizuar", "ukinut", "abolished", "repealed")
+
+def _relation_kind(label: str) -> str:
+    t = (label or "").lower()
+    if any(k in t for k in ("shfuqiz", "ukid", "ukinut", "abolish", "repeal")):
+        if any(k in t for k in ("pjesërisht", "delimi", "partial")):
+            return "repeal_partial"
+        return "repeal"
+    if any(k in t for k in ("ndrysh", "plotës", "izmen", "dopun", "amend", "supplement", "shtuar")):
+        return "amend"
+    return "related"
+
+def extract_relations(detail_html: str) -> Dict[str, Any]:
+    """Lidhjet ndryshon/plotëson/shfuqizon nga faqja e detajeve të aktit.
+
+    `in` – aktet që e ndryshojnë/shfuqizojnë këtë akt; `out` – aktet që ky akt i ndryshon/shfuqizon.
+    """
+    soup = BeautifulSoup(detail_html, "lxml")
+    rel: Dict[str, Any] = {"repealed": False, "in": [], "out": []}
+    status = soup.select_one("#MainContent_divInForce")
+    if status and any(m in status.get_text(" ", strip=True).lower() for m in _REPEALED_MARKERS):
+        rel["repealed"] = True
+    for sel, direction in _REL_SECTIONS:
+        section = soup.select_one(sel)
+        if not section:
+            continue
+        for box in section.select(".act_link_box_1"):
+            a = box.select_one("a[href*='ActDetail.aspx?ActID=']")
+            m_id = re.search(r"ActID=(\d+)", a.get("href") or "") if a else None
+            if not m_id:
+                continue
+            label = box.select_one(".span_margin")
+            conn = box.select_one(".act_detail_conn")
+            m_date = re.search(r"\d{2}[./]\d{2}[./]\d{4}", conn.get_text(" ", strip=True)) if conn else None
+            rel[direction].append({
+                "kind": _relation_kind(label.get_text(" ", strip=True) if label else ""),
+                "act_id": m_id.group(1),
+                "title": a.get_text(" ", strip=True),
+                "published_on": m_date.group(0) if m_date else None,
+            })
+    return rel
+
 def _extract_act_number(s: str) -> Optional[str]:
     m = re.search(r"(\d{2}/L-\d{3})", s or "", flags=re.I)
     return m.group(1) if m else None
@@ -196,14 +239,14 @@ def _extract_year_triggers(seed_html: str) -> List[Dict[str, Any]]:
         out.append(t)
     return out
 
-def _fetch_year_html(seed_url: str, seed_html: str, trig: Dict[str, Any]) -> str:
+def _fetch_year_html(seed_url: str, seed_html: str, trig: Dict[str, Any], refresh: bool = False) -> str:
     cache_key = f"{seed_url}|{trig.get('method')}|{trig.get('target')}|{trig.get('arg')}|{trig.get('url')}"
-    c = _cache_read(cache_key)
+    c = None if refresh else _cache_read(cache_key)
     if c:
         return c
 
     if trig.get("method") == "get" and trig.get("url"):
-        html = http_get_cached(trig["url"])
+        html = http_get_cached(trig["url"], refresh=refresh)
         _cache_write(cache_key, html)
         return html
 
@@ -213,11 +256,11 @@ def _fetch_year_html(seed_url: str, seed_html: str, trig: Dict[str, Any]) -> str
     data["__EVENTARGUMENT"] = trig.get("arg", "")
     headers = dict(HEADERS)
     headers["Referer"] = seed_url
-    r = SESS.post(seed_url, headers=headers, data=data, timeout=60)
+    r = SESS.post(upstream_url(seed_url), headers=headers, data=data, timeout=60)
     r.raise_for_status()
     html = r.text
     _cache_write(cache_key, html)
-    time.sleep(0.4)
+    polite_sleep(0.4)
     return html
 
 
@@ -279,13 +322,16 @@ def _extract_acts_from_html(html: str, year: Optional[int]) -> List[Dict[str, An
             "act_id": m_id.group(1) if m_id else None,
             "detail_url": _force_sq_url(detail_url),
             "pdf_url": pdf_url,
-            "published_on": published_on
+            "published_on": published_on,
+            "relations": extract_relations(detail_html_sq)
         })
     return acts
 
 
-def crawl_category(seed_url: str, from_year: Optional[int] = None, to_year: Optional[int] = None) -> List[Dict[str, Any]]:
-    seed_html = http_get_cached(seed_url)
+def crawl_category(seed_url: str, from_year: Optional[int] = None, to_year: Optional[int] = None,
+                   refresh: bool = False) -> List[Dict[str, Any]]:
+    """`refresh=True` i rimerr faqet e listimit (seed + vitet) nga burimi; faqet e detajeve mbeten në cache."""
+    seed_html = http_get_cached(seed_url, refresh=refresh)
     triggers = _extract_year_triggers(seed_html)
 
     results: List[Dict[str, Any]] = []
@@ -299,7 +345,7 @@ def crawl_category(seed_url: str, from_year: Optional[int] = None, to_year: Opti
             continue
         if to_year and y and y > to_year:
             continue
-        html = _fetch_year_html(seed_url, seed_html, t)
+        html = _fetch_year_html(seed_url, seed_html, t, refresh=refresh)
         results.extend(_extract_acts_from_html(html, year=y))
 
     seen = set()
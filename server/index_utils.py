@@ -1,4 +1,4 @@
-import os, re, json, time, hashlib, urllib.parse as _u
+import os, re, json, time, hashlib, tempfile, urllib.parse as _u
 from typing import Optional
 import requests
 from bs4 import BeautifulSoup
@@ -10,36 +10,53 @@ HEADERS = {
     "Cookie": "LangID=1"
 }
 
+# GZK_UPSTREAM: adresë alternative nga e cila shkarkohen faqet (p.sh. stand-in lokal për testime);
+# çelësat e cache-it mbeten gjithmonë mbi URL-në kanonike të BASE.
+UPSTREAM = os.environ.get("GZK_UPSTREAM", "").rstrip("/")
+# GZK_FETCH_DELAY: mbishkruan pauzën e mirësjelljes pas çdo kërkese të pa-cache-uar (p.sh. 0 për stand-in).
+FETCH_DELAY = float(os.environ["GZK_FETCH_DELAY"]) if os.environ.get("GZK_FETCH_DELAY") else None
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-CACHE_DIR = os.path.join(ROOT, "cache")
+CACHE_DIR = os.environ.get("KOSOVO_CACHE_DIR") or os.path.join(ROOT, "cache")
 HTML_DIR = os.path.join(CACHE_DIR, "html")
 PDF_DIR = os.path.join(CACHE_DIR, "pdf")
 TXT_DIR = os.path.join(CACHE_DIR, "txt")
 INDEX_PATH = os.path.join(CACHE_DIR, "index.jsonl")
+CATALOG_PATH = os.path.join(CACHE_DIR, "catalog.json")
+SNAPSHOT_MANIFEST_PATH = os.path.join(CACHE_DIR, "snapshot.json")
+GRAPH_PATH = os.path.join(CACHE_DIR, "graph.json")
 
 for d in [CACHE_DIR, HTML_DIR, PDF_DIR, TXT_DIR]:
     os.makedirs(d, exist_ok=True)
 
 SESS = requests.Session()
 
+def polite_sleep(seconds: float) -> None:
+    time.sleep(seconds if FETCH_DELAY is None else FETCH_DELAY)
+
 def urljoin(url: str) -> str:
     return url if url.startswith("http") else _u.urljoin(BASE, url)
 
+def upstream_url(url: str) -> str:
+    if UPSTREAM and url.startswith(BASE):
+        return UPSTREAM + url[len(BASE):]
+    return url
+
 def _hash(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()[:24]
 
-def http_get_cached(url: str) -> str:
+def http_get_cached(url: str, refresh: bool = False) -> str:
     h = _hash(url)
     p = os.path.join(HTML_DIR, f"{h}.html")
-    if os.path.exists(p):
+    if not refresh and os.path.exists(p):
         with open(p, "r", encoding="utf-8", errors="ignore") as f:
             return f.read()
-    r = SESS.get(url, headers=HEADERS, timeout=30)
+    r = SESS.get(upstream_url(url), headers=HEADERS, timeout=30)
     r.raise_for_status()
     text = r.text
     with open(p, "w", encoding="utf-8") as f:
         f.write(text)
-    time.sleep(0.5)
+    polite_sleep(0.5)
     return text
 
 def soup_for(url: str) -> BeautifulSoup:
@@ -53,11 +70,11 @@ def download_pdf(url: str) -> Optional[str]:
     p = os.path.join(PDF_DIR, f"{h}.pdf")
     if os.path.exists(p) and os.path.getsize(p) > 0:
         return p
-    r = SESS.get(u, headers=HEADERS, timeout=60)
+    r = SESS.get(upstream_url(u), headers=HEADERS, timeout=60)
     r.raise_for_status()
     with open(p, "wb") as f:
         f.write(r.content)
-    time.sleep(0.5)
+    polite_sleep(0.5)
     return p
 
 def read_text_cache(key: str) -> Optional[str]:
@@ -72,3 +89,17 @@ def write_text_cache(key: str, text: str) -> str:
     with open(p, "w", encoding="utf-8") as f:
         f.write(text)
     return p
+
+def write_json_atomic(path: str, data) -> None:
+    """Shkruan JSON përmes një skedari të përkohshëm unik dhe os.replace (i sigurt me shumë shkrues)."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -1,18 +1,10 @@
 from io import StringIO
-import re, json, os
-from typing import Dict, List, Any, Optional
-from pdfminer.high_level import extract_text_to_fp
-from pdfminer.layout import LAParams
-
-
-try:
-   
-    from pdfminer.high_level import extract_text_to_fp as _extract_text_to_fp
-    extract_text_to_fp = _extract_text_to_fp
-except Exception:
-    pass
-
-from pdfminer.layout import LAParams
+import re, json, os, bisect, unicodedata
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from pdfminer.layout import LAParams, LTChar, LTContainer
+from pdfminer.converter import TextConverter, PDFPageAggregator
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
 from index_utils import download_pdf, read_text_cache, write_text_cache, INDEX_PATH, soup_for
 
 ARTICLE_PATTERNS = [
@@ -21,19 +13,185 @@ ARTICLE_PATTERNS = [
     r"(?mi)^Član\s+\d+[\.:]?",
 ]
 
-def pdf_to_text_cached(pdf_url: str) -> str:
-    cached = read_text_cache(pdf_url)
-    if cached is not None:
-        return cached
+PAGE_CACHE_VERSION = 2
+MAX_GARBLED_RATIO = 0.05
+MIN_PAGE_CHARS = 20
+# Pragjet e rindërtimit të rreshtave pa layout, në njësi të madhësisë së shkronjës.
+LINE_TOLERANCE = 0.5
+SPACE_GAP = 0.15
+# Kolonat: brez vertikal (>= MIN_GUTTER_WIDTH pt) që e prek boja e shumë pak rreshtave
+# (<= MAX_GUTTER_LINES) dhe që ka të paktën MIN_COLUMN_SHARE të shkronjave në secilën anë.
+MIN_GUTTER_WIDTH = 4.0
+MAX_GUTTER_LINES = 0.05
+MIN_COLUMN_SHARE = 0.2
+
+_CID = re.compile(r"\(cid:\d+\)")
+# Titull neni i ngjitur në fund të një rreshti me tekst tjetër – rast që analiza e plotë e layout-it
+# mund ta ndajë; referencat brenda fjalisë ("… sipas Neni 5 të …") nuk numërohen.
+_GLUED_HEADING = re.compile(r"(?m)\S[ \t]+(?:Neni|NENI|Article|ARTICLE|Član|ČLAN)\s+\d+[\.:]?[ \t]*$")
+
+
+def _garbled_ratio(text: str) -> float:
+    visible = [c for c in text if not c.isspace()]
+    if not visible:
+        return 0.0
+    bad = sum(len(m) for m in _CID.findall(text))
+    bad += sum(1 for c in visible if c == "\ufffd" or unicodedata.category(c) in ("Co", "Cc", "Cn"))
+    return bad / len(visible)
+
+
+def page_text_ok(text: Optional[str]) -> bool:
+    """Heuristikat e cilësisë: tekst i mjaftueshëm, pak shenja të prishura dhe asnjë titull
+    "Neni N" i ngjitur pas tekstit tjetër në të njëjtin rresht."""
+    if text is None or len(text.strip()) < MIN_PAGE_CHARS:
+        return False
+    if _garbled_ratio(text) > MAX_GARBLED_RATIO:
+        return False
+    return _GLUED_HEADING.search(text) is None
+
+
+def _chars(item: LTContainer) -> Iterator[LTChar]:
+    for child in item:
+        if isinstance(child, LTChar):
+            yield child
+        elif isinstance(child, LTContainer):
+            yield from _chars(child)
+
+
+def _has_columns(lines: List[List[LTChar]]) -> bool:
+    """Kërkon një hapësirë ndërmjet kolonave: brez x në të cilin pothuajse asnjë rresht nuk ka bojë,
+    me tekst të mjaftueshëm majtas dhe djathtas. Hapësirat ndërmjet fjalëve (edhe në tekst të justifikuar)
+    ndryshojnë pozitë nga rreshti në rresht, prandaj nuk formojnë brez të tillë."""
+    ink = [[c for c in line if c.get_text().strip()] for line in lines]
+    ink = [line for line in ink if line]
+    if len(ink) < 2:
+        return False
+    left = int(min(c.x0 for line in ink for c in line))
+    right = int(max(c.x1 for line in ink for c in line)) + 1
+    cover = [0] * (right - left)
+    for line in ink:
+        hit = set()
+        for c in line:
+            hit.update(range(int(c.x0) - left, int(c.x1) + 1 - left))
+        for b in hit:
+            cover[b] += 1
+    limit = MAX_GUTTER_LINES * len(ink)
+    mids = sorted((c.x0 + c.x1) / 2 for line in ink for c in line)
+    b = 0
+    while b < len(cover):
+        if cover[b] > limit:
+            b += 1
+            continue
+        start = b
+        while b < len(cover) and cover[b] <= limit:
+            b += 1
+        if b - start >= MIN_GUTTER_WIDTH and 0 < start and b < len(cover):
+            x = left + (start + b) / 2
+            share = bisect.bisect_left(mids, x) / len(mids)
+            if MIN_COLUMN_SHARE <= share <= 1 - MIN_COLUMN_SHARE:
+                return True
+    return False
+
+
+def no_layout_page_text(rsrc: PDFResourceManager, page: PDFPage) -> Optional[str]:
+    """Nxjerrje pa analizë layout-i (laparams=None): rreshtat rindërtohen nga koordinata y e
+    shkronjave. Kthen None për faqe me shumë kolona, ku rendi i leximit kërkon layout-in e plotë."""
+    dev = PDFPageAggregator(rsrc, laparams=None)
+    PDFPageInterpreter(rsrc, dev).process_page(page)
+    chars = list(_chars(dev.get_result()))
+    chars.sort(key=lambda c: (-(c.y0 + c.y1) / 2, c.x0))
+    lines: List[List[LTChar]] = []
+    mid = 0.0
+    for c in chars:
+        m = (c.y0 + c.y1) / 2
+        if lines and abs(m - mid) <= max(c.size, 1.0) * LINE_TOLERANCE:
+            lines[-1].append(c)
+        else:
+            lines.append([c])
+            mid = m
+    if _has_columns(lines):
+        return None
+    out: List[str] = []
+    for line in lines:
+        line.sort(key=lambda c: c.x0)
+        buf = [line[0].get_text()]
+        for prev, c in zip(line, line[1:]):
+            gap = c.x0 - prev.x1
+            size = max(min(prev.size, c.size), 1.0)
+            if gap > SPACE_GAP * size and not buf[-1].endswith(" ") and c.get_text() != " ":
+                buf.append(" ")
+            buf.append(c.get_text())
+        out.append("".join(buf).rstrip())
+    return "\n".join(out) + "\n\f" if out else "\f"
+
+
+def layout_page_text(rsrc: PDFResourceManager, page: PDFPage) -> Optional[str]:
+    buf = StringIO()
+    dev = TextConverter(rsrc, buf, laparams=LAParams())
+    try:
+        PDFPageInterpreter(rsrc, dev).process_page(page)
+    finally:
+        dev.close()
+    return buf.getvalue()
+
+
+# Nivelet e nxjerrjes, nga më i liri te më i shtrenjti; i fundit pranohet pa kontroll cilësie.
+EXTRACTION_TIERS: List[Tuple[str, Callable[[PDFResourceManager, PDFPage], Optional[str]]]] = [
+    ("no_layout", no_layout_page_text),
+    ("layout", layout_page_text),
+]
+
+
+def extract_page(rsrc: PDFResourceManager, page: PDFPage) -> Tuple[str, str]:
+    """Kthen (teksti, emri i nivelit që u pranua)."""
+    text: Optional[str] = None
+    name = ""
+    for i, (name, fn) in enumerate(EXTRACTION_TIERS):
+        text = fn(rsrc, page)
+        if i == len(EXTRACTION_TIERS) - 1 or page_text_ok(text):
+            break
+    return text or "", name
+
+
+def _page_key(pdf_url: str, page_no: int) -> str:
+    return f"{pdf_url}#page={page_no}#v{PAGE_CACHE_VERSION}"
+
+
+def _pages_key(pdf_url: str) -> str:
+    return f"{pdf_url}#pages#v{PAGE_CACHE_VERSION}"
+
+
+def pdf_pages_cached(pdf_url: str) -> List[str]:
+    """Teksti i çdo faqeje të PDF-së. Cache-i i faqeve (plus numri i faqeve) është burimi i vetëm:
+    dokumenti rindërtohet prej tij pa e hapur PDF-në, dhe rinxjerrja përpunon vetëm faqet që mungojnë."""
+    count = read_text_cache(_pages_key(pdf_url))
+    if count is not None and count.strip().isdigit():
+        pages = [read_text_cache(_page_key(pdf_url, i)) for i in range(int(count))]
+        if all(p is not None for p in pages):
+            return pages  # type: ignore[return-value]
     path = download_pdf(pdf_url)
     if not path:
-        return ""
-    buf = StringIO()
+        return []
+    out: List[str] = []
+    rsrc = PDFResourceManager()
     with open(path, "rb") as f:
-        extract_text_to_fp(f, buf, laparams=LAParams(), output_type="text", codec=None)
-    text = buf.getvalue()
-    write_text_cache(pdf_url, text)
-    return text
+        for page_no, page in enumerate(PDFPage.get_pages(f)):
+            key = _page_key(pdf_url, page_no)
+            text = read_text_cache(key)
+            if text is None:
+                text, _ = extract_page(rsrc, page)
+                write_text_cache(key, text)
+            out.append(text)
+    write_text_cache(_pages_key(pdf_url), str(len(out)))
+    return out
+
+
+def pdf_to_text_cached(pdf_url: str) -> str:
+    # Cache-i i vjetër i dokumentit të plotë (para cache-it të faqeve) lexohet ende, por nuk shkruhet më.
+    legacy = read_text_cache(pdf_url)
+    if legacy is not None:
+        return legacy
+    return "".join(pdf_pages_cached(pdf_url))
 
 def split_articles(text: str) -> List[Dict[str, str]]:
     if not text:
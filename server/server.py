@@ -1,12 +1,14 @@
 
-import os, json, re, time
+import os, json, re, time, base64, threading
 from typing import List, Dict, Any, Optional, Tuple
 from fastmcp import FastMCP
 from rapidfuzz import process, fuzz
 
-from index_utils import BASE, INDEX_PATH
-from gzk_category import crawl_category
+from index_utils import BASE, INDEX_PATH, CATALOG_PATH, http_get_cached, write_json_atomic
+from gzk_category import crawl_category, extract_relations
 from pdf_ingest import pdf_to_text_cached, split_articles, build_snippet, add_to_index
+from snapshot import import_snapshot, read_manifest
+import act_graph
 
 
 mcp = FastMCP("kosovo-laws-mcp")
@@ -61,15 +63,194 @@ def _looks_like_listing(prompt: str) -> bool:
     return any(k in t for k in kw)
 
 
+ACT_COMPACT_FIELDS = ("act_id", "title", "year")
+ARTICLE_COMPACT_FIELDS = ("act_id", "title", "article_no", "year", "score", "repealed")
+REPEALED_PENALTY = 20
+_GRAPH: act_graph.Graph = act_graph.load_graph()
+_GRAPH_LOCK = threading.Lock()
+_CATALOG_TTL = 900
+_CATALOG_CACHE: Dict[Tuple[int, int], Tuple[float, List[Dict[str, Any]]]] = {}
+_CATALOG_LOCK = threading.Lock()
+
+
+SortKey = Tuple[int, str, str, str, str]
+
+
+def _sort_key(r: Dict[str, Any]) -> SortKey:
+    # `crawl_category` deduplikon sipas (act_id, title): i njëjti akt mund të shfaqet me disa tituj,
+    # prandaj titulli dhe detail_url e bëjnë çelësin unik dhe kursorin të pavarur nga barazimet.
+    return (r.get("year") or 0, r.get("published_on") or "", r.get("act_id") or "",
+            r.get("title") or "", r.get("detail_url") or "")
+
+
+def _in_years(r: Dict[str, Any], from_year: Optional[int], to_year: Optional[int]) -> bool:
+    # Si në `crawl_category`: rreshtat pa vit nuk përjashtohen nga filtri.
+    y = r.get("year")
+    return not (from_year and y and y < from_year) and not (to_year and y and y > to_year)
+
+
+def _sorted_catalog(inst_id: int = 1, cat_id: int = 6,
+                    from_year: Optional[int] = None,
+                    to_year: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Katalogu i renditur për një kategori; mbahet në memorie një kopje e plotë për (inst_id, cat_id)
+    dhe vitet filtrohen këtu, që çdo varg vitesh nga `ask` të mos mbajë kopje të veta."""
+    key = (inst_id, cat_id)
+    hit = _CATALOG_CACHE.get(key)
+    if hit and time.time() - hit[0] < _CATALOG_TTL:
+        rows = hit[1]
+    else:
+        seed = SEED_TEMPLATE.format(inst_id=inst_id, cat_id=cat_id)
+        rows = sorted(crawl_category(seed), key=_sort_key, reverse=True)
+        _record_relations(rows)
+        with _CATALOG_LOCK:
+            _CATALOG_CACHE[key] = (time.time(), rows)
+            _save_catalog()
+    if from_year is None and to_year is None:
+        return rows
+    return [r for r in rows if _in_years(r, from_year, to_year)]
+
+
+def _record_relations(rows: List[Dict[str, Any]]) -> int:
+    """Kalon lidhjet ndryshon/shfuqizon të rreshtave në grafin e akteve (pa rrjet për faqet në cache)."""
+    pending = []
+    for r in rows:
+        rel = r.pop("relations", None)
+        aid = r.get("act_id")
+        if not aid:
+            continue
+        if rel is None:
+            with _GRAPH_LOCK:
+                parsed = _GRAPH.get(str(aid), {}).get("parsed")
+            if parsed or not r.get("detail_url"):
+                continue
+            try:
+                rel = extract_relations(http_get_cached(r["detail_url"]))
+            except Exception:
+                continue
+        pending.append((aid, rel, r.get("title"), r.get("published_on")))
+    if pending:
+        with _GRAPH_LOCK:
+            for aid, rel, title, published_on in pending:
+                act_graph.add_relations(_GRAPH, aid, rel, title, published_on)
+            act_graph.save_graph(_GRAPH)
+    return len(pending)
+
+
+def _rank_in_force(items: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    with _GRAPH_LOCK:
+        for it in items:
+            it["repealed"] = act_graph.is_repealed(_GRAPH, it.get("act_id"))
+    for it in items:
+        if it["repealed"]:
+            it["score"] = it.get("score", 0) - REPEALED_PENALTY
+    return sorted(items, key=lambda it: it.get("score", 0), reverse=True)[:k]
+
+
+def _catalog_key(key: Tuple[int, int]) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _parse_catalog_key(s: str, complete: bool = True) -> Optional[Tuple[int, int]]:
+    """`inst:cat`; me `complete=True` çelësat e vjetër `inst:cat:from:to` me kufij vitesh (katalog i pjesshëm)
+    kthejnë None."""
+    parts = s.split(":")
+    if complete and len(parts) == 4 and any(parts[2:]):
+        return None
+    try:
+        return int(parts[0]), int(parts[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _save_catalog() -> None:
+    """Thirret me `_CATALOG_LOCK` të mbajtur."""
+    data = {_catalog_key(k): {"ts": ts, "rows": rows} for k, (ts, rows) in _CATALOG_CACHE.items()}
+    write_json_atomic(CATALOG_PATH, data)
+
+
+def _load_catalog() -> int:
+    """Ngarkon katalogun e ruajtur (p.sh. nga një snapshot) në memorie, me kohën e crawl-it për çdo çelës."""
+    if not os.path.exists(CATALOG_PATH):
+        return 0
+    try:
+        with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return 0
+    with _CATALOG_LOCK:
+        for k, v in data.items():
+            key = _parse_catalog_key(k)
+            if key is None:
+                continue
+            ts, rows = (float(v.get("ts") or 0), v.get("rows") or []) if isinstance(v, dict) else (0.0, v)
+            # Rirenditet: skedarët e vjetër (ose nga snapshot-e të vjetra) mund të jenë renditur me çelës tjetër.
+            _CATALOG_CACHE[key] = (ts, sorted(rows, key=_sort_key, reverse=True))
+    return len(_CATALOG_CACHE)
+
+
+def _project(row: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if not fields:
+        return dict(row)
+    return {f: row[f] for f in fields if f in row}
+
+
+def _pick_fields(fields: Optional[List[str]], compact: bool,
+                 compact_fields: Tuple[str, ...]) -> Optional[List[str]]:
+    if fields:
+        return list(fields)
+    return list(compact_fields) if compact else None
+
+
+def _encode_cursor(query: Dict[str, Any], last: SortKey) -> str:
+    """Kursor keyset: filtrat + çelësi i renditjes i elementit të fundit të faqes."""
+    raw = json.dumps({"q": query, "k": list(last)}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Dict[str, Any], SortKey]:
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + pad).decode("utf-8"))
+        y, pub, aid, title, url = data["k"]
+        return dict(data["q"]), (int(y), str(pub), str(aid), str(title), str(url))
+    except Exception:
+        raise ValueError("Kursor i pavlefshëm.")
+
+
 def _list_category_pdfs_core(inst_id: int = 1, cat_id: int = 6,
                              from_year: Optional[int] = None, to_year: Optional[int] = None,
                              limit: int = 200) -> List[Dict[str, Any]]:
-    seed = SEED_TEMPLATE.format(inst_id=inst_id, cat_id=cat_id)
-    rows = crawl_category(seed, from_year=from_year, to_year=to_year)
-    return sorted(rows, key=lambda r: (r.get("year") or 0, r.get("published_on") or ""), reverse=True)[:limit]
+    return _sorted_catalog(inst_id, cat_id, from_year, to_year)[:limit]
+
+
+def _list_category_page_core(inst_id: int = 1, cat_id: int = 6,
+                             from_year: Optional[int] = None, to_year: Optional[int] = None,
+                             page_size: int = 50, cursor: Optional[str] = None,
+                             fields: Optional[List[str]] = None,
+                             compact: bool = False) -> Dict[str, Any]:
+    last: Optional[SortKey] = None
+    if cursor:
+        q, last = _decode_cursor(cursor)
+        inst_id, cat_id = q.get("inst_id", inst_id), q.get("cat_id", cat_id)
+        from_year, to_year = q.get("from_year"), q.get("to_year")
+    query = {"inst_id": inst_id, "cat_id": cat_id, "from_year": from_year, "to_year": to_year}
+    page_size = max(1, min(page_size, 200))
+    rows = _sorted_catalog(inst_id, cat_id, from_year, to_year)
+    # Rreshtat janë në rend zbritës sipas _sort_key; vazhdohet rreptësisht pas elementit të fundit,
+    # që aktet e reja të publikuara ndërmjet faqeve të mos zhvendosin faqet pasuese.
+    start = 0
+    if last is not None:
+        start = next((i for i, r in enumerate(rows) if _sort_key(r) < last), len(rows))
+    page = rows[start:start + page_size]
+    keep = _pick_fields(fields, compact, ACT_COMPACT_FIELDS)
+    more = start + len(page) < len(rows)
+    return {"items": [_project(r, keep) for r in page],
+            "total": len(rows),
+            "next_cursor": _encode_cursor(query, _sort_key(page[-1])) if page and more else None}
 
 
 def _ingest_rows(rows: List[Dict[str, Any]]) -> int:
+    _record_relations(rows)
     indexed = 0
     total = len(rows)
     for i, r in enumerate(rows, start=1):
@@ -161,14 +342,14 @@ def _search_articles_core(query: str, k: int = 8) -> List[Dict[str, Any]]:
     if not rows:
         return []
     corpus = [f"{r['title']} {r['article_no']} {r['snippet']}" for r in rows]
-    results = process.extract(query, corpus, scorer=fuzz.WRatio, limit=k)
+    results = process.extract(query, corpus, scorer=fuzz.WRatio, limit=k * 3)
     out = []
     for r in results:
         score, idx = (r[1], r[2]) if isinstance(r, tuple) else (r.score, r.index)
         item = dict(rows[idx])
         item["score"] = int(score)
         out.append(item)
-    return out
+    return _rank_in_force(out, k)
 
 def _search_acts_core(query: str, inst_id: int = 1, cat_id: int = 6,
                       from_year: Optional[int] = None, to_year: Optional[int] = None,
@@ -178,14 +359,83 @@ def _search_acts_core(query: str, inst_id: int = 1, cat_id: int = 6,
     if not rows:
         return []
     corpus = [r["title"] for r in rows]
-    results = process.extract(query, corpus, scorer=fuzz.WRatio, limit=k)
+    results = process.extract(query, corpus, scorer=fuzz.WRatio, limit=k * 3)
     out = []
     for r in results:
         score, idx = (r[1], r[2]) if isinstance(r, tuple) else (r.score, r.index)
         item = dict(rows[idx])
         item["score"] = int(score)
         out.append(item)
-    return out
+    return _rank_in_force(out, k)
+
+
+_DELTA_MAX_ROWS = 50
+
+
+def _refresh_catalog_since(key: Tuple[int, int], since_year: int, known: set) -> List[Dict[str, Any]]:
+    """Rimerr nga burimi vetëm faqet e listimit për vitet >= `since_year` dhe i shton katalogut
+    të kategorisë aktet që nuk njiheshin; kthen aktet e reja."""
+    inst_id, cat_id = key
+    seed = SEED_TEMPLATE.format(inst_id=inst_id, cat_id=cat_id)
+    fresh = crawl_category(seed, from_year=since_year, refresh=True)
+    new = [r for r in fresh if r.get("act_id") and str(r["act_id"]) not in known]
+    _record_relations(fresh)
+    if new:
+        with _CATALOG_LOCK:
+            hit = _CATALOG_CACHE.get(key)
+            rows = sorted((hit[1] if hit else []) + new, key=_sort_key, reverse=True)
+            _CATALOG_CACHE[key] = (time.time(), rows)
+            _save_catalog()
+    return new
+
+
+@_with_lock
+def _apply_snapshot_delta(max_rows: int = _DELTA_MAX_ROWS) -> Dict[str, Any]:
+    """Indeksohen vetëm aktet e publikuara pas snapshot-it: crawl i freskët i viteve nga `created_at`
+    e tutje, krahasuar me aktet që snapshot-i i njihte (indeksi + katalogu)."""
+    manifest = read_manifest()
+    if not manifest:
+        return {"indexed": 0, "skipped": True}
+    created = str(manifest.get("created_at") or "")
+    since_year = int(created[:4]) if created[:4].isdigit() else None
+    if since_year is None:
+        return {"indexed": 0, "skipped": True}
+    keys = sorted({k for k in (_parse_catalog_key(c, complete=False) for c in manifest.get("catalog_keys", [])) if k})
+    known = {str(a) for a in manifest.get("act_ids", [])}
+    with _CATALOG_LOCK:
+        for key in keys:
+            hit = _CATALOG_CACHE.get(key)
+            known.update(str(r["act_id"]) for r in (hit[1] if hit else []) if r.get("act_id"))
+    new: List[Dict[str, Any]] = []
+    for key in keys:
+        for r in _refresh_catalog_since(key, since_year, known):
+            known.add(str(r["act_id"]))
+            new.append(r)
+    new = sorted((r for r in new if r.get("pdf_url")), key=_sort_key, reverse=True)[:max_rows]
+    added = _ingest_rows(new) if new else 0
+    return {"indexed": added, "new_acts": len(new), "snapshot_version": manifest.get("version"),
+            "skipped": False}
+
+
+def _boot_from_snapshot(bundle_path: str) -> None:
+    if _index_size() > 0:
+        print("ℹ️ Indeksi ekziston – snapshot-i nuk importohet.")
+        return
+    manifest = import_snapshot(bundle_path)
+    _load_catalog()
+    with _GRAPH_LOCK:
+        _GRAPH.clear()
+        _GRAPH.update(act_graph.load_graph())
+    print(f"📦 U ngarkua snapshot-i {manifest.get('version')} ({_index_size()} nene).")
+
+    def _delta() -> None:
+        try:
+            delta = _apply_snapshot_delta()
+            print(f"🔁 Delta pas snapshot-it: {delta.get('indexed', 0)} nene të reja.")
+        except Exception as e:
+            print(f"⚠️ Delta pas snapshot-it dështoi: {e}")
+
+    threading.Thread(target=_delta, name="snapshot-delta", daemon=True).start()
 
 
 def _bootstrap_index_if_needed(query_hint: Optional[str] = None) -> None:
@@ -202,8 +452,19 @@ def _bootstrap_index_if_needed(query_hint: Optional[str] = None) -> None:
 @mcp.tool("list_category_pdfs")
 def list_category_pdfs(inst_id: int = 1, cat_id: int = 6,
                        from_year: Optional[int] = None, to_year: Optional[int] = None,
-                       limit: int = 200) -> List[Dict[str, Any]]:
-    return _list_category_pdfs_core(inst_id, cat_id, from_year, to_year, limit)
+                       limit: int = 200, fields: Optional[List[str]] = None,
+                       compact: bool = False) -> List[Dict[str, Any]]:
+    keep = _pick_fields(fields, compact, ACT_COMPACT_FIELDS)
+    return [_project(r, keep) for r in _list_category_pdfs_core(inst_id, cat_id, from_year, to_year, limit)]
+
+@mcp.tool("list_category_page")
+def list_category_page(inst_id: int = 1, cat_id: int = 6,
+                       from_year: Optional[int] = None, to_year: Optional[int] = None,
+                       page_size: int = 50, cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
+    """Listim me faqe; kalo `next_cursor` për faqen pasuese (filtrat ruhen në kursor)."""
+    return _list_category_page_core(inst_id, cat_id, from_year, to_year,
+                                    page_size, cursor, fields, compact)
 
 @mcp.tool("ingest_pdfs")
 def ingest_pdfs(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -211,7 +472,28 @@ def ingest_pdfs(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 @mcp.tool("index_stats")
 def index_stats() -> Dict[str, Any]:
-    return {"index_rows": _index_size(), "index_path": INDEX_PATH}
+    manifest = read_manifest() or {}
+    return {"index_rows": _index_size(), "index_path": INDEX_PATH,
+            "graph_acts": len(_GRAPH),
+            "snapshot_version": manifest.get("version")}
+
+@mcp.tool("act_relations")
+def act_relations(act_id: str) -> Dict[str, Any]:
+    """Lidhjet e drejtpërdrejta: aktet që e ndryshojnë/shfuqizojnë aktin dhe aktet që ai i ndryshon."""
+    with _GRAPH_LOCK:
+        res = act_graph.act_relations(_GRAPH, str(act_id))
+    if res is None:
+        return {"ok": False, "act_id": str(act_id), "error": "Akti nuk gjendet në grafin e ndryshimeve."}
+    return res
+
+@mcp.tool("amendment_chain")
+def amendment_chain(act_id: str) -> Dict[str, Any]:
+    """Zinxhiri i ndryshimeve/shfuqizimeve të aktit dhe akti(et) në fuqi që e zëvendësojnë."""
+    with _GRAPH_LOCK:
+        res = act_graph.amendment_chain(_GRAPH, str(act_id))
+    if res is None:
+        return {"ok": False, "act_id": str(act_id), "error": "Akti nuk gjendet në grafin e ndryshimeve."}
+    return res
 
 @mcp.tool("ensure_index")
 def ensure_index(inst_id: int = 1, cat_id: int = 6,
@@ -220,8 +502,10 @@ def ensure_index(inst_id: int = 1, cat_id: int = 6,
     return _ensure_index_years(inst_id, cat_id, from_year, to_year, max_rows)
 
 @mcp.tool("search_articles")
-def search_articles(query: str, k: int = 8) -> List[Dict[str, Any]]:
-    return _search_articles_core(query, k)
+def search_articles(query: str, k: int = 8, fields: Optional[List[str]] = None,
+                    compact: bool = False) -> List[Dict[str, Any]]:
+    keep = _pick_fields(fields, compact, ARTICLE_COMPACT_FIELDS)
+    return [_project(r, keep) for r in _search_articles_core(query, k)]
 
 @mcp.tool("which_law_applies")
 def which_law_applies(prompt: str, k: int = 8) -> Dict[str, Any]:
@@ -236,16 +520,21 @@ def which_law_applies(prompt: str, k: int = 8) -> Dict[str, Any]:
             "disclaimer": "Ky rezultat është informues dhe NUK përbën këshillë ligjore. Verifiko në Gazetën Zyrtare."}
 
 @mcp.tool("ask")
-def ask(prompt: str) -> Dict[str, Any]:
+def ask(prompt: str, cursor: Optional[str] = None, page_size: int = 50,
+        fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, Any]:
     fy, ty = _parse_years(prompt)
     try:
-        if fy or ty or _looks_like_listing(prompt):
-            result = _list_category_pdfs_core(inst_id=1, cat_id=6,
+        if cursor or fy or ty or _looks_like_listing(prompt):
+            result = _list_category_page_core(inst_id=1, cat_id=6,
                                               from_year=fy, to_year=ty,
-                                              limit=200 if (fy or ty) else 50)
+                                              page_size=page_size, cursor=cursor,
+                                              fields=fields, compact=compact)
         else:
             _bootstrap_index_if_needed(prompt)
             result = which_law_applies.fn(prompt)
+            keep = _pick_fields(fields, compact, ARTICLE_COMPACT_FIELDS)
+            if keep:
+                result["candidates"] = [_project(c, keep) for c in result["candidates"]]
         return {"ok": True, "prompt": prompt, "result": result}
     except Exception as e:
         return {"ok": False, "error": str(e), "prompt": prompt}
@@ -277,7 +566,12 @@ def _log_request(tool: str, payload: Any):
         f.write(f"[{ts}] {tool}: {json.dumps(payload, ensure_ascii=False)}\n")
 
 
+_load_catalog()
+
+
 if __name__ == "__main__":
-    print("🚀 Running Kosovo Laws MCP (Stable) – tools: list_category_pdfs, ingest_pdfs, index_stats, "
-          "ensure_index, search_articles, which_law_applies, ask, debug_category")
-    mcp.run(transport="sse", host="0.0.0.0", port=8000)
+    if os.environ.get("KOSOVO_SNAPSHOT"):
+        _boot_from_snapshot(os.environ["KOSOVO_SNAPSHOT"])
+    print("🚀 Running Kosovo Laws MCP (Stable) – tools: list_category_pdfs, list_category_page, ingest_pdfs, index_stats, "
+          "ensure_index, act_relations, amendment_chain, search_articles, which_law_applies, ask, debug_category")
+    mcp.run(transport="sse", host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
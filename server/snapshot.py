@@ -0,0 +1,230 @@
+"""Eksport/import i korpusit të ndërtuar (katalogu, indeksi i neneve, grafi i ndryshimeve, teksti i PDF-ve, cache HTML)
+në një paketë të vetme tar.gz me manifest dhe checksum për çdo skedar.
+
+    python server/snapshot.py export korpusi.tar.gz
+    python server/snapshot.py import korpusi.tar.gz
+
+Checksum-et vërtetojnë vetëm integritetin, jo prejardhjen: importo vetëm paketa nga burime të besuara.
+Nëse vendoset KOSOVO_SNAPSHOT_KEY, manifesti nënshkruhet me HMAC-SHA256 gjatë eksportit dhe
+importi refuzon paketat pa nënshkrim të vlefshëm.
+"""
+import os, io, re, json, time, hmac, hashlib, tarfile, tempfile, shutil, argparse
+from typing import Any, Dict, List, Optional
+
+from index_utils import CACHE_DIR, HTML_DIR, TXT_DIR, INDEX_PATH, CATALOG_PATH, GRAPH_PATH, SNAPSHOT_MANIFEST_PATH
+
+SNAPSHOT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+SIGNATURE_NAME = "manifest.sig"
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+_FILES = {"index.jsonl": INDEX_PATH, "catalog.json": CATALOG_PATH, "graph.json": GRAPH_PATH}
+_DIRS = {"txt": TXT_DIR, "html": HTML_DIR}
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _members() -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for arc, path in _FILES.items():
+        if os.path.exists(path):
+            out[arc] = path
+    for prefix, d in _DIRS.items():
+        for name in sorted(os.listdir(d)):
+            p = os.path.join(d, name)
+            if os.path.isfile(p):
+                out[f"{prefix}/{name}"] = p
+    return out
+
+
+def _trim_partial_line(path: str) -> None:
+    """Heq një rresht të fundit të papërfunduar (shkrim në vazhdim gjatë kopjimit)."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _stage(members: Dict[str, str], work: str) -> Dict[str, str]:
+    """Kopjon skedarët në `work`, që checksum-i dhe tar-i të lexojnë të njëjtën përmbajtje edhe kur
+    një nyje aktive e shkruan cache-in gjatë eksportit."""
+    staged: Dict[str, str] = {}
+    for arc, src in members.items():
+        dst = os.path.join(work, *arc.split("/"))
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            shutil.copyfile(src, dst)
+        except FileNotFoundError:
+            continue
+        if arc == "index.jsonl":
+            _trim_partial_line(dst)
+        staged[arc] = dst
+    return staged
+
+
+def _act_ids(index_path: str) -> List[str]:
+    ids = set()
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            try:
+                aid = json.loads(line).get("act_id")
+            except Exception:
+                continue
+            if aid:
+                ids.add(str(aid))
+    return sorted(ids)
+
+
+def _safe_arcname(name: str) -> bool:
+    """Lejohen vetëm emrat e njohur: skedarët e `_FILES` ose `<txt|html>/<emër>` pa nëndirektori."""
+    if name in _FILES:
+        return True
+    prefix, sep, rest = name.partition("/")
+    return bool(sep) and prefix in _DIRS and bool(_SAFE_NAME.match(rest))
+
+
+def _signing_key() -> Optional[bytes]:
+    key = os.environ.get("KOSOVO_SNAPSHOT_KEY")
+    return key.encode("utf-8") if key else None
+
+
+def _sign(raw: bytes, key: bytes) -> str:
+    return hmac.new(key, raw, hashlib.sha256).hexdigest()
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, raw: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(raw)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(raw))
+
+
+def read_manifest() -> Optional[Dict[str, Any]]:
+    """Manifesti i paketës së fundit të importuar në këtë nyje (ose None)."""
+    if not os.path.exists(SNAPSHOT_MANIFEST_PATH):
+        return None
+    with open(SNAPSHOT_MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_snapshot(out_path: str) -> Dict[str, Any]:
+    """Eksporton nga një kopje e cache-it, jo nga skedarët që nyja aktive mund t'i rishkruajë."""
+    with tempfile.TemporaryDirectory(dir=CACHE_DIR) as work:
+        members = _stage(_members(), work)
+        if "index.jsonl" not in members:
+            raise RuntimeError("Indeksi është bosh – nuk ka çka të eksportohet.")
+        checksums = {arc: _sha256_file(p) for arc, p in members.items()}
+        digest = hashlib.sha256("".join(f"{a}:{c}\n" for a, c in sorted(checksums.items())).encode("utf-8"))
+        created = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        catalog_keys: List[str] = []
+        if "catalog.json" in members:
+            with open(members["catalog.json"], "r", encoding="utf-8") as f:
+                catalog_keys = sorted(json.load(f).keys())
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": f"{created}-{digest.hexdigest()[:12]}",
+            "created_at": created,
+            "act_ids": _act_ids(members["index.jsonl"]),
+            "catalog_keys": catalog_keys,
+            "files": checksums,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        tmp = out_path + ".part"
+        key = _signing_key()
+        with tarfile.open(tmp, "w:gz") as tar:
+            raw = json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8")
+            _add_bytes(tar, MANIFEST_NAME, raw)
+            if key:
+                _add_bytes(tar, SIGNATURE_NAME, _sign(raw, key).encode("ascii"))
+            for arc, p in members.items():
+                tar.add(p, arcname=arc, recursive=False)
+        os.replace(tmp, out_path)
+    return manifest
+
+
+def import_snapshot(bundle_path: str) -> Dict[str, Any]:
+    """Verifikon emrat, nënshkrimin (nëse ka çelës) dhe checksum-et, pastaj vendos përmbajtjen
+    e paketës në cache/; kthen manifestin. Paketa duhet të vijë nga një burim i besuar."""
+    with tempfile.TemporaryDirectory(dir=CACHE_DIR) as work:
+        with tarfile.open(bundle_path, "r:gz") as tar:
+            members = tar.getmembers()
+            for m in members:
+                if m.name in (MANIFEST_NAME, SIGNATURE_NAME):
+                    continue
+                if not m.isfile() or not _safe_arcname(m.name):
+                    raise ValueError(f"Skedar i papritur në paketë: {m.name}")
+            names = {m.name for m in members}
+            f = tar.extractfile(MANIFEST_NAME) if MANIFEST_NAME in names else None
+            if f is None:
+                raise ValueError("Paketa nuk ka manifest.")
+            raw = f.read()
+            key = _signing_key()
+            if key:
+                sig = tar.extractfile(SIGNATURE_NAME) if SIGNATURE_NAME in names else None
+                if sig is None or not hmac.compare_digest(sig.read().decode("ascii", "ignore").strip(),
+                                                          _sign(raw, key)):
+                    raise ValueError("Nënshkrimi i manifestit mungon ose është i pavlefshëm.")
+            manifest = json.loads(raw.decode("utf-8"))
+            if manifest.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"Format i panjohur i paketës: {manifest.get('format')}")
+            files: Dict[str, str] = manifest.get("files") or {}
+            bad = [a for a in files if not _safe_arcname(a)]
+            if bad:
+                raise ValueError(f"Emër i papranueshëm në manifest: {bad[0]}")
+            for m in members:
+                if m.name in (MANIFEST_NAME, SIGNATURE_NAME):
+                    continue
+                if m.name not in files:
+                    raise ValueError(f"Skedar i papritur në paketë: {m.name}")
+                src = tar.extractfile(m)
+                dst = os.path.join(work, *m.name.split("/"))
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                with open(dst, "wb") as out:
+                    shutil.copyfileobj(src, out)
+
+        for arc, digest in files.items():
+            p = os.path.join(work, *arc.split("/"))
+            if not os.path.exists(p) or _sha256_file(p) != digest:
+                raise ValueError(f"Checksum nuk përputhet: {arc}")
+
+        for prefix, d in _DIRS.items():
+            src_dir = os.path.join(work, prefix)
+            if not os.path.isdir(src_dir):
+                continue
+            for name in os.listdir(src_dir):
+                dst = os.path.join(d, name)
+                if not os.path.exists(dst):
+                    os.replace(os.path.join(src_dir, name), dst)
+        for arc, path in _FILES.items():
+            p = os.path.join(work, arc)
+            if os.path.exists(p):
+                os.replace(p, path)
+
+    with open(SNAPSHOT_MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Eksport/import i korpusit të Kosovo Laws MCP.")
+    ap.add_argument("command", choices=["export", "import"])
+    ap.add_argument("path")
+    args = ap.parse_args(argv)
+    if args.command == "export":
+        m = export_snapshot(args.path)
+        print(f"📦 U eksportua {args.path} (version {m['version']}, {len(m['files'])} skedarë, "
+              f"{len(m['act_ids'])} akte).")
+    else:
+        m = import_snapshot(args.path)
+        print(f"✅ U importua version {m['version']} ({len(m['act_ids'])} akte).")
+
+
+if __name__ == "__main__":
+    main()